@@ -19,6 +19,11 @@ from telegram.ext import (  # type: ignore[import-untyped]
     filters,
 )
 
+try:
+    import uvloop  # type: ignore[import-untyped]
+except ModuleNotFoundError:
+    uvloop = None  # type: ignore[assignment]
+
 from meme_wrangler.config import cfg
 from meme_wrangler.db import close_pool, init_db
 from meme_wrangler.poster import (
@@ -102,29 +107,68 @@ async def _supervise_task(
             backoff = min(backoff * 2, _BACKOFF_MAX_SECONDS)
 
 
+# Command name -> handler coroutine.  One table instead of a dozen
+# add_handler lines; PTB still owns dispatch, so filter semantics
+# (group handling, /cmd@botname, etc.) are unchanged.
+COMMANDS: dict[str, Callable] = {
+    "start": start,
+    "help": helpcmd,
+}
+
+# Owner-gated commands get a filters.User gate at registration, so
+# non-owner updates are dropped before the coroutine is entered.  The
+# @owner_only decorator on each handler stays as defence in depth (and
+# keeps the handlers safe to call outside PTB dispatch).
+OWNER_COMMANDS: dict[str, Callable] = {
+    "postnow": postnow,
+    "scheduled": scheduled,
+    "unschedule": unschedule,
+    "preview": preview,
+    "log": logcmd,
+    "backup": backup,
+    "restore": restore,
+    "backupstatus": backupstatus,
+    "verifybackup": verifybackup,
+    "scheduleat": scheduleat,
+}
+
+
+class _PrivateMediaFilter(filters.MessageFilter):
+    """Flattened ``ChatType.PRIVATE & (PHOTO | VIDEO | ANIMATION)``.
+
+    One Python expression per message instead of walking PTB's combined
+    filter tree (four filter objects and their operator plumbing).
+    """
+
+    def filter(self, message) -> bool:
+        return message.chat.type == message.chat.PRIVATE and bool(
+            message.photo or message.video or message.animation
+        )
+
+
+_PRIVATE_MEDIA_FILTER = _PrivateMediaFilter(name="meme_wrangler.private_media")
+
+
 def _register_handlers(app: Application) -> None:
     """Register all command and message handlers."""
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", helpcmd))
-    app.add_handler(CommandHandler("postnow", postnow))
-    app.add_handler(CommandHandler("scheduled", scheduled))
-    app.add_handler(CommandHandler("unschedule", unschedule))
-    app.add_handler(CommandHandler("preview", preview))
-    app.add_handler(CommandHandler("log", logcmd))
-    app.add_handler(CommandHandler("backup", backup))
-    app.add_handler(CommandHandler("restore", restore))
-    app.add_handler(CommandHandler("backupstatus", backupstatus))
-    app.add_handler(CommandHandler("verifybackup", verifybackup))
-    app.add_handler(CommandHandler("scheduleat", scheduleat))
-
-    media_filter = filters.ChatType.PRIVATE & (
-        filters.PHOTO | filters.VIDEO | filters.ANIMATION
+    for name, handler in COMMANDS.items():
+        app.add_handler(CommandHandler(name, handler))
+
+    owner_filter = filters.User(user_id=cfg.owner_ids)
+    for name, handler in OWNER_COMMANDS.items():
+        app.add_handler(CommandHandler(name, handler, filters=owner_filter))
+
+    app.add_handler(
+        MessageHandler(_PRIVATE_MEDIA_FILTER & owner_filter, handle_media)
     )
-    app.add_handler(MessageHandler(media_filter, handle_media))
 
 
 async def post_init(application: Application) -> None:
-    """PTB lifecycle hook: log identity and start supervised background tasks."""
+    """PTB lifecycle hook: init the DB, log identity, start background tasks."""
+    # Pool creation and migrations run here, inside PTB's own loop,
+    # instead of on a throwaway pre-start loop in main().
+    await init_db()
+
     me = await application.bot.get_me()
     logger.info("Bot connected as @%s (id=%s)", me.username, me.id)
 
@@ -168,12 +212,18 @@ def build_application() -> Application:
 
 
 def main() -> None:
-    """Validate config, initialise the DB, register handlers, and run."""
+    """Validate config, register handlers, and run."""
     cfg.validate()
 
+    if uvloop is not None:
+        uvloop.install()
+        logger.info("uvloop installed as the asyncio event loop policy")
+
     loop = asyncio.new_event_loop()
+    if hasattr(asyncio, "eager_task_factory"):  # Python >= 3.12
+        loop.set_task_factory(asyncio.eager_task_factory)
+        logger.info("Eager task factory enabled")
     asyncio.set_event_loop(loop)
-    loop.run_until_complete(init_db())
 
     app = build_application()
 
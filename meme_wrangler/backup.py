@@ -6,14 +6,20 @@ import gzip
 import hashlib
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 from uuid import uuid4
 
+try:
+    import orjson  # type: ignore[import-untyped]
+except ModuleNotFoundError:
+    orjson = None  # type: ignore[assignment]
+
 from meme_wrangler.config import cfg, IST
 from meme_wrangler.db import get_pool
-from meme_wrangler.models import BackupPayload, BackupStatus, Meme
+from meme_wrangler.models import BackupStatus, Meme
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +34,51 @@ def _checksum(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def _json_dumps(obj: Any) -> bytes:
+    """Compact JSON bytes - orjson when available, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes - orjson when available, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+class _HashingWriter:
+    """File-like wrapper that feeds every written chunk into a hash.
+
+    Lets ``create_backup`` compute the sidecar checksum of the compressed
+    stream while writing it, without buffering the file in memory.
+    """
+
+    def __init__(self, fh, hasher) -> None:
+        self._fh = fh
+        self._hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self._hasher.update(data)
+        return self._fh.write(data)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+
 def _backup_dir() -> Path:
     cfg.backup_dir.mkdir(parents=True, exist_ok=True)
     return cfg.backup_dir
 
 
+_SQL_BACKUP_ROWS = (
+    "SELECT id, owner_file_id, mime_type, scheduled_ts, "
+    "       posted, created_ts, preview_file_id, caption "
+    "FROM memes ORDER BY id"
+)
+
+
 # ---------------------------------------------------------------------------
 # Core backup operations
 # ---------------------------------------------------------------------------
@@ -45,36 +91,63 @@ async def create_backup(
 ) -> tuple[Path, int, int]:
     """Export all memes as a gzip-compressed JSON file.
 
+    Rows are serialised straight into the compressed output one record at
+    a time, so peak memory stays flat regardless of table size; scheduled
+    memes are recorded as an ID list instead of duplicated records
+    (format version 3).
+
     Returns ``(backup_path, total_memes, scheduled_count)``.
     """
     pool = await get_pool()
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            "SELECT id, owner_file_id, mime_type, scheduled_ts, "
-            "       posted, created_ts, preview_file_id, caption "
-            "FROM memes ORDER BY id"
-        )
-
-    memes = [Meme.from_record(r) for r in rows]
-    scheduled = [m for m in memes if m.posted == 0]
-
-    payload = BackupPayload(
-        version=2,
-        generated_at=datetime.now(IST).isoformat(),
-        memes=memes,
-        scheduled_memes=scheduled,
-    )
-
-    raw_json = json.dumps(payload.to_dict(), indent=2).encode("utf-8")
-    compressed = gzip.compress(raw_json)
-    digest = _checksum(compressed)
 
+    now_ist = datetime.now(IST)
     backup_root = _backup_dir()
-    timestamp = datetime.now(IST).strftime("%Y%m%d-%H%M%S-%f")
+    timestamp = now_ist.strftime("%Y%m%d-%H%M%S-%f")
     filename = f"memes-backup-{timestamp}-{uuid4().hex[:8]}.json.gz"
     backup_path = backup_root / filename
 
-    backup_path.write_bytes(compressed)
+    total = 0
+    scheduled_ids: list[int] = []
+    hasher = hashlib.sha256()
+    uncompressed_size = 0
+
+    # Stream into a sibling temp file and rename into place afterwards, so
+    # a crash mid-export can never leave a truncated backup behind.
+    tmp_path = backup_path.with_name(backup_path.name + ".tmp")
+
+    with tmp_path.open("wb") as fh:
+        with gzip.GzipFile(
+            fileobj=_HashingWriter(fh, hasher), mode="wb"
+        ) as gz:
+
+            def write(chunk: bytes) -> None:
+                nonlocal uncompressed_size
+                uncompressed_size += len(chunk)
+                gz.write(chunk)
+
+            write(b'{"version": 3, "generated_at": ')
+            write(_json_dumps(now_ist.isoformat()))
+            write(b', "memes": [')
+            # Server-side cursor streams rows in chunks instead of
+            # materialising the whole table; cursors need a transaction.
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    async for row in conn.cursor(_SQL_BACKUP_ROWS, prefetch=500):
+                        meme = Meme.from_record(row)
+                        if not meme.posted:
+                            scheduled_ids.append(meme.id)
+                        if total:
+                            write(b",")
+                        write(_json_dumps(meme.to_dict()))
+                        total += 1
+            write(b'], "scheduled_meme_ids": ')
+            write(_json_dumps(scheduled_ids))
+            write(b"}")
+
+    os.replace(tmp_path, backup_path)
+
+    digest = hasher.hexdigest()
+    compressed_size = backup_path.stat().st_size
 
     # Write checksum sidecar
     sidecar = backup_path.with_suffix(backup_path.suffix + ".sha256")
@@ -83,20 +156,23 @@ async def create_backup(
     logger.info(
         "Backup written to %s (%d bytes, checksum %s)",
         backup_path,
-        len(compressed),
+        compressed_size,
         digest[:12],
     )
 
     # Store metadata (and optionally payload) in the DB
     if cfg.backup_store_in_db:
         try:
+            payload_json: Optional[bytes] = None
+            if uncompressed_size < 5_000_000:
+                payload_json = gzip.decompress(backup_path.read_bytes())
             await _store_backup_in_db(
                 filename=filename,
-                total=len(memes),
-                scheduled=len(scheduled),
+                total=total,
+                scheduled=len(scheduled_ids),
                 checksum=digest,
-                payload_json=raw_json if len(raw_json) < 5_000_000 else None,
-                size_bytes=len(compressed),
+                payload_json=payload_json,
+                size_bytes=compressed_size,
             )
         except Exception as exc:
             logger.warning("Failed to store backup metadata in DB: %s", exc)
@@ -117,14 +193,14 @@ async def create_backup(
                     send_document_to,
                     InputFile(fh, filename=filename),
                     caption=(
-                        f"Backup created: {len(memes)} total memes "
-                        f"({len(scheduled)} scheduled)."
+                        f"Backup created: {total} total memes "
+                        f"({len(scheduled_ids)} scheduled)."
                     ),
                 )
         except Exception as exc:
             logger.warning("Failed to send backup document via Telegram: %s", exc)
 
-    return backup_path, len(memes), len(scheduled)
+    return backup_path, total, len(scheduled_ids)
 
 
 async def _store_backup_in_db(
@@ -237,7 +313,7 @@ def load_backup_data(raw: bytes) -> dict:
         decompressed = gzip.decompress(raw)
     except gzip.BadGzipFile:
         decompressed = raw  # plain JSON
-    return json.loads(decompressed.decode("utf-8"))
+    return _json_loads(decompressed)
 
 
 async def restore_memes(memes: list[Meme]) -> int:
@@ -252,14 +328,21 @@ async def restore_memes(memes: list[Meme]) -> int:
         async with conn.transaction():
             await conn.execute("TRUNCATE TABLE memes RESTART IDENTITY")
             if records:
-                await conn.executemany(
-                    """
-                    INSERT INTO memes
-                        (id, owner_file_id, mime_type, scheduled_ts,
-                         posted, created_ts, preview_file_id, caption)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    """,
-                    records,
+                # COPY protocol - one bulk transfer instead of an INSERT
+                # round-trip per record.
+                await conn.copy_records_to_table(
+                    "memes",
+                    records=records,
+                    columns=[
+                        "id",
+                        "owner_file_id",
+                        "mime_type",
+                        "scheduled_ts",
+                        "posted",
+                        "created_ts",
+                        "preview_file_id",
+                        "caption",
+                    ],
                 )
                 max_id = max(r[0] for r in records)
             else:
@@ -305,7 +388,10 @@ async def get_backup_status() -> BackupStatus:
         try:
             data = load_backup_data(latest.read_bytes())
             total_memes = len(data.get("memes", []))
-            sched_memes = len(data.get("scheduled_memes", []))
+            # v3 backups carry an ID list; older ones duplicate records.
+            sched_memes = len(
+                data.get("scheduled_meme_ids", data.get("scheduled_memes", []))
+            )
         except Exception:
             pass
 
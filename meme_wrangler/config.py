@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import hmac
 import logging
 import os
 from datetime import time
 from pathlib import Path
 from typing import Optional, Set
-from urllib.parse import urlparse, urlunparse, quote
+from urllib.parse import ParseResult, urlparse, urlunparse, quote
 from zoneinfo import ZoneInfo
 
 try:
@@ -20,6 +22,11 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_BACKUP_INTERVAL_HOURS = 6.0
 DEFAULT_BACKUP_RETAIN_COUNT = 10
+# Sized for the actual workload: one owner issuing command bursts plus
+# the background poster.  Each idle Postgres backend costs ~10MB RSS,
+# so stay small by default; MEMEBOT_DB_POOL_MIN/MAX override per deploy.
+DEFAULT_DB_POOL_MIN = 1
+DEFAULT_DB_POOL_MAX = 4
 
 # ---------------------------------------------------------------------------
 # Timezone helpers
@@ -59,6 +66,10 @@ def ensure_ist(dt) -> "datetime":  # noqa: F821
 
 SLOTS = [time(11, 0), time(16, 0), time(21, 0)]
 
+# IST is a fixed +05:30 offset with no DST, so IST wall time converts to
+# epoch seconds by plain subtraction - no tz database lookup needed.
+IST_OFFSET_SECONDS = 19800
+
 # ---------------------------------------------------------------------------
 # Database URL construction
 # ---------------------------------------------------------------------------
@@ -73,6 +84,22 @@ def _normalize_database_url(url: str) -> str:
     if not host_override or host_override in {"localhost", "127.0.0.1", "::1"}:
         return url
 
+    return _rewrite_database_host(
+        url, host_override, os.environ.get("POSTGRES_PORT")
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _rewrite_database_host(
+    url: str,
+    host_override: str,
+    port_env: Optional[str],
+) -> str:
+    """Pure, cached half of ``_normalize_database_url``.
+
+    Keyed on everything it depends on, so repeated Config construction
+    (process start, tests) reuses one urlparse/urlunparse round.
+    """
     parsed = urlparse(url)
     if parsed.hostname not in {"localhost", "127.0.0.1", "::1"}:
         return url
@@ -86,7 +113,6 @@ def _normalize_database_url(url: str) -> str:
     if parsed.port is not None:
         port_fragment = f":{parsed.port}"
     else:
-        port_env = os.environ.get("POSTGRES_PORT")
         port_fragment = f":{port_env}" if port_env else ""
 
     target_host = host_override
@@ -135,6 +161,11 @@ class Config:
 
     def __init__(self) -> None:
         self.database_url: Optional[str] = build_database_url()
+        # Parsed once so the Neon detection below doesn't re-run
+        # urlparse on the same URL.
+        self.database_url_parsed: Optional[ParseResult] = (
+            urlparse(self.database_url) if self.database_url else None
+        )
         self.bot_token: Optional[str] = os.environ.get("TELEGRAM_BOT_TOKEN")
 
         # Owner IDs (comma-separated)
@@ -159,6 +190,18 @@ class Config:
         self.backup_password_hash: str = (
             os.environ.get("MEMEBOT_BACKUP_PASSWORD_HASH") or _hardcoded_hash
         )
+        # Decoded once so verification compares raw 32-byte digests instead
+        # of hex strings; None when the configured hash isn't valid hex.
+        try:
+            self._backup_password_hash_bytes: Optional[bytes] = bytes.fromhex(
+                self.backup_password_hash
+            )
+        except ValueError:
+            logger.error(
+                "MEMEBOT_BACKUP_PASSWORD_HASH is not valid hex; "
+                "backup password checks will fail"
+            )
+            self._backup_password_hash_bytes = None
         self._parse_errors: list[tuple[str, str]] = []
         self.backup_interval_hours = self._parse_float_env(
             "MEMEBOT_BACKUP_INTERVAL_HOURS",
@@ -173,11 +216,23 @@ class Config:
             in {"true", "1", "yes"}
         )
 
-        # Neon awareness
-        self.is_neon: bool = (
-            is_neon_url(self.database_url) if self.database_url else False
+        # Pool sizing (None = let db.py pick a workload-appropriate default)
+        self.db_pool_min: Optional[int] = self._parse_optional_int_env(
+            "MEMEBOT_DB_POOL_MIN"
+        )
+        self.db_pool_max: Optional[int] = self._parse_optional_int_env(
+            "MEMEBOT_DB_POOL_MAX"
         )
 
+        # Neon awareness (reuses the pre-parsed URL)
+        if self.database_url_parsed is not None:
+            hostname = (self.database_url_parsed.hostname or "").lower()
+            self.is_neon: bool = (
+                ".neon.tech" in hostname or ".neon." in hostname
+            )
+        else:
+            self.is_neon = False
+
         logger.info("Configured owner IDs: %s", self.owner_ids)
         if self.is_neon:
             logger.info("Neon database detected - SSL and retry logic enabled")
@@ -202,6 +257,16 @@ class Config:
             self._parse_errors.append((key, raw_value))
             return default
 
+    def _parse_optional_int_env(self, key: str) -> Optional[int]:
+        raw_value = os.environ.get(key)
+        if raw_value is None:
+            return None
+        try:
+            return int(raw_value)
+        except ValueError:
+            self._parse_errors.append((key, raw_value))
+            return None
+
     # ------------------------------------------------------------------
     def validate(self) -> None:
         """Raise *SystemExit* when mandatory settings are missing."""
@@ -233,12 +298,10 @@ class Config:
 
     def verify_backup_password(self, candidate: Optional[str]) -> bool:
         """Check *candidate* against the stored SHA-256 hash."""
-        if not candidate:
+        if not candidate or self._backup_password_hash_bytes is None:
             return False
-        digest = hashlib.sha256(candidate.encode("utf-8")).hexdigest()
-        import hmac
-
-        return hmac.compare_digest(digest, self.backup_password_hash)
+        digest = hashlib.sha256(candidate.encode("utf-8")).digest()
+        return hmac.compare_digest(digest, self._backup_password_hash_bytes)
 
 
 # Singleton - created at import time so every module shares the same object.
@@ -12,7 +12,7 @@ try:
 except ModuleNotFoundError:
     asyncpg = None  # type: ignore[assignment]
 
-from meme_wrangler.config import cfg
+from meme_wrangler.config import DEFAULT_DB_POOL_MAX, DEFAULT_DB_POOL_MIN, cfg
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +21,93 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _pool: Optional["asyncpg.Pool"] = None
+_pool_lock = asyncio.Lock()
 _schema_version: int = 0
 
+# ---------------------------------------------------------------------------
+# Prepared statements
+# ---------------------------------------------------------------------------
+
+# SQL registered here is prepared once per pool connection, so hot queries
+# skip parse/plan on every invocation.  Callers fall back to plain SQL on
+# connections without prepared handles (e.g. test fakes).
+
+_prepared_sql: dict[str, str] = {}
+_EMPTY_STMTS: dict = {}
+
+
+if asyncpg is not None:
+
+    class _MemebotConnection(asyncpg.Connection):
+        """Connection with one extra slot for the prepared-handle map.
+
+        ``asyncpg.Connection`` declares ``__slots__``, so the stock class
+        rejects the attribute the ``init`` hook attaches; the pool is
+        created with ``connection_class=_MemebotConnection`` instead.
+        Attribute reads through the pool's connection proxy delegate to
+        the wrapped connection, so the helpers below see the map.
+        """
+
+        __slots__ = ("_memebot_stmts",)
+
+else:
+    _MemebotConnection = None  # type: ignore[assignment]
+
+
+def register_prepared_statement(name: str, sql: str) -> None:
+    """Register SQL to be prepared on every new pool connection."""
+    _prepared_sql[name] = sql
+
+
+async def _init_connection(conn: "asyncpg.Connection") -> None:
+    """Pool ``init`` hook: prepare all registered statements.
+
+    A statement that fails to prepare (e.g. SQL written for a newer
+    schema than the database currently has) is skipped rather than
+    allowed to kill the connection - asyncpg closes the connection and
+    re-raises on init errors, which would take the whole pool down.
+    Callers fall back to plain SQL for any missing handle.
+    """
+    stmts = {}
+    for name, sql in _prepared_sql.items():
+        try:
+            stmts[name] = await conn.prepare(sql)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(
+                "Could not prepare statement %r (falling back to plain "
+                "SQL): %s",
+                name,
+                exc,
+            )
+    conn._memebot_stmts = stmts
+
+
+async def fetch_prepared(conn, name: str, sql: str, *args) -> list:
+    """``conn.fetch`` through the prepared handle *name* when available."""
+    stmt = getattr(conn, "_memebot_stmts", _EMPTY_STMTS).get(name)
+    if stmt is not None:
+        return await stmt.fetch(*args)
+    return await conn.fetch(sql, *args)
+
+
+async def fetchrow_prepared(conn, name: str, sql: str, *args):
+    """``conn.fetchrow`` through the prepared handle *name* when available."""
+    stmt = getattr(conn, "_memebot_stmts", _EMPTY_STMTS).get(name)
+    if stmt is not None:
+        return await stmt.fetchrow(*args)
+    return await conn.fetchrow(sql, *args)
+
+
+async def execute_prepared(conn, name: str, sql: str, *args) -> None:
+    """Run a statement through the prepared handle *name* when available."""
+    stmt = getattr(conn, "_memebot_stmts", _EMPTY_STMTS).get(name)
+    if stmt is not None:
+        await stmt.fetch(*args)
+    else:
+        await conn.execute(sql, *args)
+
 # ---------------------------------------------------------------------------
 # Migrations
 # ---------------------------------------------------------------------------
@@ -82,6 +167,76 @@ MIGRATIONS: list[list[str]] = [
         )
         """,
     ],
+    # --- v4: server-side slot computation (mirrors config.SLOTS) ---
+    [
+        """
+        CREATE OR REPLACE FUNCTION next_meme_slot(after_ts BIGINT)
+        RETURNS BIGINT AS $fn$
+        DECLARE
+            ist_local TIMESTAMP :=
+                to_timestamp(after_ts) AT TIME ZONE 'Asia/Kolkata';
+            day_start TIMESTAMP := date_trunc('day', ist_local);
+            -- 11:00, 16:00, 21:00 IST as seconds past midnight
+            slot_seconds INTEGER[] := ARRAY[39600, 57600, 75600];
+            slot INTEGER;
+            candidate TIMESTAMP;
+        BEGIN
+            FOREACH slot IN ARRAY slot_seconds LOOP
+                candidate := day_start + make_interval(secs => slot);
+                IF candidate > ist_local THEN
+                    RETURN EXTRACT(EPOCH FROM
+                        (candidate AT TIME ZONE 'Asia/Kolkata'))::BIGINT;
+                END IF;
+            END LOOP;
+            RETURN EXTRACT(EPOCH FROM
+                ((day_start + INTERVAL '1 day'
+                  + make_interval(secs => slot_seconds[1]))
+                 AT TIME ZONE 'Asia/Kolkata'))::BIGINT;
+        END;
+        $fn$ LANGUAGE plpgsql STABLE
+        """,
+    ],
+    # --- v5: notify the poster when the schedule changes ---
+    [
+        """
+        CREATE OR REPLACE FUNCTION notify_meme_due() RETURNS trigger AS $fn$
+        BEGIN
+            PERFORM pg_notify('memes_due', NEW.id::text);
+            RETURN NEW;
+        END;
+        $fn$ LANGUAGE plpgsql
+        """,
+        """
+        DROP TRIGGER IF EXISTS trg_memes_due_notify ON memes
+        """,
+        """
+        CREATE TRIGGER trg_memes_due_notify
+            AFTER INSERT OR UPDATE OF scheduled_ts ON memes
+            FOR EACH ROW EXECUTE FUNCTION notify_meme_due()
+        """,
+    ],
+    # --- v6: posted becomes a real boolean (1 byte vs 4, NOT posted
+    #     predicates); the partial index is rebuilt on the new predicate ---
+    [
+        """
+        DROP INDEX IF EXISTS idx_memes_pending
+        """,
+        """
+        ALTER TABLE memes ALTER COLUMN posted DROP DEFAULT
+        """,
+        """
+        ALTER TABLE memes
+            ALTER COLUMN posted TYPE BOOLEAN USING posted::int::boolean
+        """,
+        """
+        ALTER TABLE memes ALTER COLUMN posted SET DEFAULT FALSE
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_memes_pending
+            ON memes (scheduled_ts)
+            WHERE NOT posted
+        """,
+    ],
 ]
 
 
@@ -116,6 +271,34 @@ async def _run_migrations(conn: "asyncpg.Connection") -> None:
     logger.info("Schema is at version %d", _schema_version)
 
 
+# The bot's hottest read: the next pending meme (postnow / poster wakeup).
+# idx_memes_pending (migration v2) exists precisely for this shape.
+_HOT_QUERY = (
+    "SELECT id FROM memes WHERE NOT posted "
+    "ORDER BY scheduled_ts ASC LIMIT 1"
+)
+
+
+async def _verify_hot_query_plan(conn: "asyncpg.Connection") -> None:
+    """Warn at startup if the hot pending-meme query stopped using an index.
+
+    Catches silent regressions (dropped index, planner flip after bloat)
+    that would otherwise only show up as growing postnow latency.
+    """
+    try:
+        rows = await conn.fetch("EXPLAIN " + _HOT_QUERY)
+    except Exception:
+        logger.debug("Could not EXPLAIN hot query", exc_info=True)
+        return
+    plan = "\n".join(row[0] for row in rows)
+    if "Index" in plan:
+        logger.info("Pending-meme query is index-backed")
+    else:
+        logger.warning(
+            "Pending-meme query is NOT using an index; plan:\n%s", plan
+        )
+
+
 # ---------------------------------------------------------------------------
 # Pool creation (Neon-aware)
 # ---------------------------------------------------------------------------
@@ -146,24 +329,40 @@ async def create_pool() -> "asyncpg.Pool":
 
     ssl_ctx = _build_ssl_context()
     max_retries = 3 if cfg.is_neon else 1
-    max_size = 3 if cfg.is_neon else 5
+
+    # Neon serverless keeps per-branch connection limits low, so stay small
+    # there unless the operator overrides the size via env vars.
+    if cfg.is_neon:
+        default_min, default_max = 1, 3
+    else:
+        default_min, default_max = DEFAULT_DB_POOL_MIN, DEFAULT_DB_POOL_MAX
+    min_size = cfg.db_pool_min if cfg.db_pool_min is not None else default_min
+    max_size = cfg.db_pool_max if cfg.db_pool_max is not None else default_max
+    min_size = min(min_size, max_size)
 
     last_exc: Optional[Exception] = None
     for attempt in range(max_retries):
         try:
+            # min_size pre-opens connections here, so the first handler
+            # invocation never pays a lazy-connect stall.
             pool = await asyncpg.create_pool(
                 cfg.database_url,
-                min_size=1,
+                min_size=min_size,
                 max_size=max_size,
+                max_inactive_connection_lifetime=300,
+                connection_class=_MemebotConnection,
+                init=_init_connection,
                 ssl=ssl_ctx,
                 command_timeout=30,
+                statement_cache_size=256,
                 server_settings={"application_name": "meme-wrangler"},
             )
             # Verify connectivity
             async with pool.acquire() as conn:
                 await conn.fetchval("SELECT 1")
             logger.info(
-                "Database pool created (max_size=%d, neon=%s)",
+                "Database pool created (min_size=%d, max_size=%d, neon=%s)",
+                min_size,
                 max_size,
                 cfg.is_neon,
             )
@@ -195,14 +394,78 @@ async def create_pool() -> "asyncpg.Pool":
 # ---------------------------------------------------------------------------
 
 
+async def _migrate_schema() -> None:
+    """Bring the schema up to date over a plain, hook-free connection.
+
+    Must run before the main pool exists: the pool's ``init`` hook
+    prepares statements against tables and functions that the migrations
+    themselves create, so a fresh (or behind) database would otherwise
+    fail every connection attempt and the pool could never come up.
+    """
+    ssl_ctx = _build_ssl_context()
+    max_retries = 3 if cfg.is_neon else 1
+
+    last_exc: Optional[Exception] = None
+    for attempt in range(max_retries):
+        try:
+            conn = await asyncpg.connect(
+                cfg.database_url,
+                ssl=ssl_ctx,
+                command_timeout=30,
+                server_settings={"application_name": "meme-wrangler-migrate"},
+            )
+            break
+        except (OSError, Exception) as exc:
+            last_exc = exc
+            if attempt < max_retries - 1:
+                wait = 2 ** attempt
+                logger.warning(
+                    "Migration connect attempt %d/%d failed: %s - "
+                    "retrying in %ds",
+                    attempt + 1,
+                    max_retries,
+                    exc,
+                    wait,
+                )
+                await asyncio.sleep(wait)
+            else:
+                raise RuntimeError(
+                    f"Could not connect for migrations after "
+                    f"{max_retries} attempts"
+                ) from last_exc
+
+    try:
+        async with conn.transaction():
+            await _run_migrations(conn)
+        await _verify_hot_query_plan(conn)
+    finally:
+        await conn.close()
+
+
 async def init_db() -> "asyncpg.Pool":
-    """Ensure the pool exists and the schema is up to date."""
+    """Ensure the schema is up to date and the pool exists.
+
+    Migrations run first, on a dedicated connection without the
+    prepared-statement hook; only then is the main pool created, so
+    statements are always prepared against the final schema.  The lock
+    serialises concurrent first calls so only one pool is ever created;
+    later calls see the cached pool and return immediately.
+    """
     global _pool
-    if _pool is None:
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+        if asyncpg is None:
+            raise RuntimeError(
+                "asyncpg must be installed to use database features."
+            )
+        if not cfg.database_url:
+            raise RuntimeError(
+                "DATABASE_URL (or MEMEBOT_DB) must point to a PostgreSQL "
+                "database"
+            )
+        await _migrate_schema()
         _pool = await create_pool()
-    async with _pool.acquire() as conn:
-        async with conn.transaction():
-            await _run_migrations(conn)
     return _pool
 
 
@@ -236,6 +499,30 @@ async def check_pool_health() -> bool:
             return False
 
 
+async def connect_listener(channel: str, callback) -> "asyncpg.Connection":
+    """Open a dedicated connection and LISTEN on *channel*.
+
+    Listener connections must live outside the pool (NOTIFY delivery is
+    per-connection).  The caller owns the returned connection and must
+    close it on shutdown.
+    """
+    if asyncpg is None:
+        raise RuntimeError(
+            "asyncpg must be installed to use database features."
+        )
+    if not cfg.database_url:
+        raise RuntimeError(
+            "DATABASE_URL (or MEMEBOT_DB) must point to a PostgreSQL database"
+        )
+    conn = await asyncpg.connect(
+        cfg.database_url,
+        ssl=_build_ssl_context(),
+        server_settings={"application_name": "meme-wrangler-listener"},
+    )
+    await conn.add_listener(channel, callback)
+    return conn
+
+
 async def close_pool() -> None:
     """Gracefully close the pool (for shutdown hooks)."""
     global _pool
@@ -16,13 +16,13 @@ def owner_only(handler: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
 
     @functools.wraps(handler)
     async def wrapper(update: Any, context: Any) -> Any:
+        # Owner fast path first: dispatch without touching update.message.
         user = update.effective_user
-        if user is None or user.id not in cfg.owner_ids:
-            if update.message:
-                await update.message.reply_text(
-                    "Only the owner can use this command."
-                )
-            return None
-        return await handler(update, context)
+        if user is not None and user.id in cfg.owner_ids:
+            return await handler(update, context)
+        message = update.message
+        if message:
+            await message.reply_text("Only the owner can use this command.")
+        return None
 
     return wrapper
@@ -2,61 +2,135 @@
 
 from __future__ import annotations
 
+import asyncio
+import calendar
 import logging
 import re
-from datetime import datetime, time as dtime
+from datetime import date, datetime
 from typing import Any
 
-from meme_wrangler.config import cfg, IST, ist_localize, SLOTS
+from meme_wrangler.config import cfg, IST, IST_OFFSET_SECONDS
 from meme_wrangler.decorators import owner_only
 from meme_wrangler.media import send_media_with_fallback
 from meme_wrangler.poster import posting_log
 from meme_wrangler.scheduling import (
+    claim_next_unposted,
     delete_memes,
     fetch_meme_by_id,
-    fetch_next_unposted,
     fetch_pending_memes,
-    mark_posted,
     reschedule_batch,
     reschedule_single,
+    unmark_posted,
 )
 
 logger = logging.getLogger(__name__)
 
+_TS_FMT = "%Y-%m-%d %H:%M:%S IST"
+
+# Compiled once; one alternation so scheduleat runs a single match pass.
+# Groups 1-3: single mode (id, HH, MM); groups 4-6: range mode
+# (start, end, YYYY-MM-DD).
+_RE_SCHED = re.compile(
+    r"(?:id:\s*(\d+)\s+(\d{2}):(\d{2})"
+    r"|ids:\s*(\d+)-(\d+)\s+(\d{4}-\d{2}-\d{2}))$"
+)
+
+# 11:00, 16:00, 21:00 as seconds past IST midnight.  IST is a fixed
+# +05:30 offset with no DST, so epoch + offset arithmetic is exact.
+_SLOT_OFFSETS = (11 * 3600, 16 * 3600, 21 * 3600)
+
+# Upper bound on a range reschedule; reschedule_batch builds O(N)
+# parameter arrays, so a typo'd range like 1-10000000 must be rejected
+# before any allocation.
+_MAX_RESCHEDULE_IDS = 10_000
+
 
 # ------------------------------------------------------------------
 # /scheduled
 # ------------------------------------------------------------------
 
+_MEDIA_GROUP_LIMIT = 10  # Telegram album cap (min 2 items per group)
+
+
+def _pending_caption(meme) -> str:
+    parts = [
+        f"ID: {meme.id}",
+        f"Time: {datetime.fromtimestamp(meme.scheduled_ts, tz=IST).strftime(_TS_FMT)}",
+        f"Type: {meme.mime_type}",
+    ]
+    if meme.caption:
+        parts.append(f"Caption: {meme.caption}")
+    return ", ".join(parts)
+
+
+async def _send_pending_row(update: Any, context: Any, meme) -> None:
+    """Original one-message-per-meme path, kept as the fallback."""
+    caption = _pending_caption(meme)
+    sent = await send_media_with_fallback(
+        context.bot,
+        update.effective_chat.id,
+        meme.preview_file_id or meme.owner_file_id,
+        mime=meme.mime_type,
+        caption=caption,
+        meme_id=meme.id,
+    )
+    if not sent:
+        await update.message.reply_text(caption)
+
+
 @owner_only
 async def scheduled(update: Any, context: Any) -> None:
-    """Show all pending memes with inline previews."""
+    """Show all pending memes with inline previews.
+
+    Plain photos and videos are grouped into albums of up to 10 via
+    ``send_media_group``, turning N Telegram calls into ceil(N/10);
+    animations (which Telegram rejects in media groups), single
+    leftovers, and any album failure fall back to the per-row send
+    chain.
+    """
     memes = await fetch_pending_memes()
     if not memes:
         await update.message.reply_text("No scheduled memes.")
         return
 
+    # Lazy import to keep top-level clean when telegram isn't installed
+    from telegram import InputMediaPhoto, InputMediaVideo  # type: ignore[import-untyped]
+
+    # One ungroupable item fails the whole send_media_group call, so
+    # anything that is not a plain photo or video goes per-row up front.
+    groupable: list = []
     for meme in memes:
-        file_id = meme.preview_file_id or meme.owner_file_id
-        parts = [
-            f"ID: {meme.id}",
-            f"Time: {datetime.fromtimestamp(meme.scheduled_ts, tz=IST).strftime('%Y-%m-%d %H:%M:%S IST')}",
-            f"Type: {meme.mime_type}",
-        ]
-        if meme.caption:
-            parts.append(f"Caption: {meme.caption}")
-        caption = ", ".join(parts)
-
-        sent = await send_media_with_fallback(
-            context.bot,
-            update.effective_chat.id,
-            file_id,
-            mime=meme.mime_type,
-            caption=caption,
-            meme_id=meme.id,
-        )
-        if not sent:
-            await update.message.reply_text(caption)
+        mime = meme.mime_type or ""
+        if mime.startswith("image") or mime.startswith("video"):
+            groupable.append(meme)
+        else:
+            await _send_pending_row(update, context, meme)
+
+    chat_id = update.effective_chat.id
+    for start in range(0, len(groupable), _MEDIA_GROUP_LIMIT):
+        chunk = groupable[start : start + _MEDIA_GROUP_LIMIT]
+        if len(chunk) == 1:
+            await _send_pending_row(update, context, chunk[0])
+            continue
+
+        media = []
+        for meme in chunk:
+            file_id = meme.preview_file_id or meme.owner_file_id
+            caption = _pending_caption(meme)
+            if meme.mime_type and meme.mime_type.startswith("video"):
+                media.append(InputMediaVideo(file_id, caption=caption))
+            else:
+                media.append(InputMediaPhoto(file_id, caption=caption))
+
+        try:
+            await context.bot.send_media_group(chat_id, media=media)
+        except Exception as exc:
+            logger.warning(
+                "send_media_group failed, falling back to per-row sends: %s",
+                exc,
+            )
+            for meme in chunk:
+                await _send_pending_row(update, context, meme)
 
 
 # ------------------------------------------------------------------
@@ -66,13 +140,16 @@ async def scheduled(update: Any, context: Any) -> None:
 @owner_only
 async def unschedule(update: Any, context: Any) -> None:
     """Remove one or more memes from the queue."""
-    if not context.args or not all(a.isdigit() for a in context.args):
+    # Single C-level pass: convert and validate in one go.
+    try:
+        ids = list(map(int, context.args or ()))
+    except ValueError:
+        ids = []
+    if not ids:
         await update.message.reply_text(
             "Usage: /unschedule <id1> <id2> ..."
         )
         return
-
-    ids = [int(a) for a in context.args]
     await delete_memes(ids)
     joined = ", ".join(str(i) for i in ids)
     await update.message.reply_text(
@@ -88,11 +165,11 @@ async def unschedule(update: Any, context: Any) -> None:
 @owner_only
 async def preview(update: Any, context: Any) -> None:
     """Preview a single meme by ID."""
-    if not context.args or not context.args[0].isdigit():
+    try:
+        meme_id = int(context.args[0])
+    except (IndexError, TypeError, ValueError):
         await update.message.reply_text("Usage: /preview <id>")
         return
-
-    meme_id = int(context.args[0])
     try:
         await update.message.reply_text(f"Previewing meme {meme_id}...")
     except Exception:
@@ -127,10 +204,15 @@ async def preview(update: Any, context: Any) -> None:
 async def postnow(update: Any, context: Any) -> None:
     """Immediately post the next scheduled meme (or a specific one)."""
     meme_id = None
-    if context.args and context.args[0].isdigit():
-        meme_id = int(context.args[0])
-
-    meme = await fetch_next_unposted(meme_id)
+    if context.args:
+        try:
+            meme_id = int(context.args[0])
+        except ValueError:
+            meme_id = None
+
+    # Claiming flags the row posted up front (one atomic statement, safe
+    # against concurrent posters); a failed send compensates below.
+    meme = await claim_next_unposted(meme_id)
     if not meme:
         label = f"with ID {meme_id}" if meme_id else ""
         await update.message.reply_text(
@@ -147,13 +229,17 @@ async def postnow(update: Any, context: Any) -> None:
         meme_id=meme.id,
     )
     if sent:
-        await mark_posted(meme.id)
         await update.message.reply_text(
             f"Posted meme with ID {meme.id} to channel."
         )
     else:
-        await update.message.reply_text(
-            f"Failed to post meme {meme.id} - all send methods failed."
+        # The compensating UPDATE and the error reply are independent
+        # I/O; run them concurrently instead of back to back.
+        await asyncio.gather(
+            unmark_posted(meme.id),
+            update.message.reply_text(
+                f"Failed to post meme {meme.id} - all send methods failed."
+            ),
         )
 
 
@@ -168,7 +254,7 @@ async def logcmd(update: Any, context: Any) -> None:
         await update.message.reply_text("No posting events yet.")
         return
     await update.message.reply_text(
-        "Last posting events:\n" + "\n".join(posting_log[-10:])
+        "Last posting events:\n" + "\n".join(list(posting_log)[-10:])
     )
 
 
@@ -189,46 +275,66 @@ async def scheduleat(update: Any, context: Any) -> None:
     argstr = " ".join(context.args)
 
     # Single: /scheduleat id: 6 16:20
-    m_single = re.match(r"id:\s*(\d+)\s+(\d{2}):(\d{2})$", argstr)
-    # Range: /scheduleat ids: 5-10 2025-10-19
-    m_range = re.match(r"ids:\s*(\d+)-(\d+)\s+(\d{4}-\d{2}-\d{2})$", argstr)
+    # Range:  /scheduleat ids: 5-10 2025-10-19
+    m = _RE_SCHED.match(argstr)
 
-    if m_single:
-        meme_id = int(m_single.group(1))
-        hour, minute = int(m_single.group(2)), int(m_single.group(3))
+    if m and m.group(1) is not None:
+        meme_id = int(m.group(1))
+        hour, minute = int(m.group(2)), int(m.group(3))
         if not (0 <= hour < 24 and 0 <= minute < 60):
             await update.message.reply_text(
                 "Invalid time format. Use 24h HH:MM."
             )
             return
+        # IST is fixed-offset, so IST wall clock -> epoch is timegm minus
+        # the offset; no pytz/zoneinfo conversion needed on this path.
         now_ist = datetime.now(IST)
-        sched_dt = ist_localize(
-            datetime(now_ist.year, now_ist.month, now_ist.day, hour, minute)
+        sched_ts = (
+            calendar.timegm(
+                (now_ist.year, now_ist.month, now_ist.day, hour, minute, 0)
+            )
+            - IST_OFFSET_SECONDS
         )
-        await reschedule_single(meme_id, int(sched_dt.timestamp()))
+        await reschedule_single(meme_id, sched_ts)
         await update.message.reply_text(
             f"Rescheduled meme ID {meme_id} for "
-            f"{sched_dt.strftime('%Y-%m-%d %H:%M')} IST."
+            f"{now_ist:%Y-%m-%d} {hour:02d}:{minute:02d} IST."
         )
 
-    elif m_range:
-        start_id = int(m_range.group(1))
-        end_id = int(m_range.group(2))
-        date_str = m_range.group(3)
-        base_date = ist_localize(datetime.strptime(date_str, "%Y-%m-%d"))
-        slot_times = [dtime(11, 0), dtime(16, 0), dtime(21, 0)]
-        ids = list(range(start_id, end_id + 1))
-        if not ids:
+    elif m:
+        start_id = int(m.group(4))
+        end_id = int(m.group(5))
+        date_str = m.group(6)
+        # Reject a backwards or oversized range up front, before any
+        # other work.
+        if end_id < start_id:
             await update.message.reply_text("Invalid ID range.")
             return
-        updates: list[tuple[int, int]] = []
-        for idx, mid in enumerate(ids):
-            slot = slot_times[idx % len(slot_times)]
-            sched_dt = base_date.replace(
-                hour=slot.hour, minute=slot.minute, second=0, microsecond=0
+        if end_id - start_id + 1 > _MAX_RESCHEDULE_IDS:
+            await update.message.reply_text(
+                f"ID range too large (max {_MAX_RESCHEDULE_IDS} IDs)."
             )
-            updates.append((int(sched_dt.timestamp()), mid))
-        await reschedule_batch(updates)
+            return
+        # Epoch of IST midnight via fixed-offset arithmetic; per-row
+        # slots are pure int adds.  The pairs stream straight into
+        # reschedule_batch without an intermediate list of tuples.
+        year, month, day = map(int, date_str.split("-"))
+        try:
+            # timegm silently normalises out-of-range days (2025-02-31
+            # becomes March 3rd), so validate the calendar date first.
+            date(year, month, day)
+        except ValueError:
+            await update.message.reply_text(
+                "Invalid date. Use YYYY-MM-DD."
+            )
+            return
+        base_ts = (
+            calendar.timegm((year, month, day, 0, 0, 0)) - IST_OFFSET_SECONDS
+        )
+        await reschedule_batch(
+            (base_ts + _SLOT_OFFSETS[idx % len(_SLOT_OFFSETS)], mid)
+            for idx, mid in enumerate(range(start_id, end_id + 1))
+        )
         await update.message.reply_text(
             f"Rescheduled memes IDs {start_id}-{end_id} for {date_str} "
             "in slots 11:00, 16:00, 21:00 IST (cycled)."
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import io
-import json
 import logging
 from typing import Any
 
@@ -38,7 +36,7 @@ async def backup(update: Any, context: Any) -> None:
         )
         logger.info("Backup exported to %s", path)
     except Exception as exc:
-        logger.exception("Backup failed: %s", exc)
+        logger.exception("Backup failed")
         await update.message.reply_text(
             f"Backup failed: {type(exc).__name__}: {exc}"
         )
@@ -68,14 +66,12 @@ async def restore(update: Any, context: Any) -> None:
         return
 
     tg_file = await context.bot.get_file(replied.document.file_id)
-    buf = io.BytesIO()
-    await tg_file.download(out=buf)
-    buf.seek(0)
-    raw = buf.read()
+    raw = bytes(await tg_file.download_as_bytearray())
 
     try:
         data = backup_mod.load_backup_data(raw)
-    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+    except ValueError as exc:
+        # Covers stdlib json, orjson, and unicode decode errors alike.
         await update.message.reply_text(f"Could not parse backup: {exc}")
         return
 
@@ -91,7 +87,7 @@ async def restore(update: Any, context: Any) -> None:
         return
 
     count = await backup_mod.restore_memes(memes)
-    scheduled_count = sum(1 for m in memes if m.posted == 0)
+    scheduled_count = sum(1 for m in memes if not m.posted)
     await update.message.reply_text(
         f"Restore complete: {count} memes imported "
         f"({scheduled_count} scheduled)."
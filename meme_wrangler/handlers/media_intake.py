@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import time
+from typing import Any, Optional
 
 from meme_wrangler.config import cfg
 from meme_wrangler.decorators import owner_only
@@ -12,6 +14,43 @@ from meme_wrangler import backup as backup_mod
 
 logger = logging.getLogger(__name__)
 
+# Minimum gap between intake-triggered backups; bulk uploads within the
+# window are covered by the last task (and by periodic_backup anyway).
+_AUTO_BACKUP_MIN_INTERVAL = 600.0
+
+_last_auto_backup = 0.0
+
+# Strong reference to the in-flight backup task; the event loop only
+# keeps weak references, so a bare create_task could be collected mid-run.
+_auto_backup_task: Optional["asyncio.Task[None]"] = None
+
+
+async def _auto_backup() -> None:
+    try:
+        path, total, sched = await backup_mod.create_backup()
+        logger.info(
+            "Auto-backup at %s after scheduling meme (total=%d, sched=%d)",
+            path,
+            total,
+            sched,
+        )
+    except Exception:
+        logger.exception("Auto-backup failed after scheduling")
+
+
+def _maybe_schedule_auto_backup() -> None:
+    """Start a background backup unless one ran within the debounce window."""
+    global _last_auto_backup, _auto_backup_task
+    now = time.monotonic()
+    if _auto_backup_task is not None and not _auto_backup_task.done():
+        return
+    if now - _last_auto_backup < _AUTO_BACKUP_MIN_INTERVAL:
+        return
+    _last_auto_backup = now
+    _auto_backup_task = asyncio.create_task(
+        _auto_backup(), name="meme_wrangler:auto_backup"
+    )
+
 
 @owner_only
 async def handle_media(update: Any, context: Any) -> None:
@@ -29,7 +68,7 @@ async def handle_media(update: Any, context: Any) -> None:
         mime = "video"
     elif msg.animation:
         file_id = msg.animation.file_id
-        mime = "image"  # GIFs treated as image
+        mime = "animation"
     else:
         await msg.reply_text("Please send a photo, animation (GIF) or video.")
         return
@@ -39,14 +78,6 @@ async def handle_media(update: Any, context: Any) -> None:
         f"Scheduled for: {scheduled_dt.strftime('%Y-%m-%d %H:%M:%S IST')}"
     )
 
-    # Automatic backup after each intake
-    try:
-        path, total, sched = await backup_mod.create_backup()
-        logger.info(
-            "Auto-backup at %s after scheduling meme (total=%d, sched=%d)",
-            path,
-            total,
-            sched,
-        )
-    except Exception as exc:
-        logger.exception("Auto-backup failed after scheduling: %s", exc)
+    # Automatic backup runs in the background (debounced) so the uploader
+    # never waits on an O(total_memes) export.
+    _maybe_schedule_auto_backup()
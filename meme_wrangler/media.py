@@ -6,7 +6,6 @@ download-reupload logic that was scattered across multiple handlers.
 
 from __future__ import annotations
 
-import io
 import logging
 from typing import Any, Optional
 
@@ -25,7 +24,8 @@ async def send_media_with_fallback(
     """Try to send *file_id* to *chat_id* using the best Telegram method.
 
     Fallback order:
-      1. ``send_video`` (if *mime* starts with ``"video"``)
+      1. ``send_video`` (if *mime* starts with ``"video"``) or
+         ``send_animation`` (if *mime* is ``"animation"``)
       2. ``send_photo``
       3. ``send_document``
       4. Download from Telegram and re-upload as document
@@ -34,34 +34,26 @@ async def send_media_with_fallback(
     """
     tag = f"meme_id={meme_id}" if meme_id else f"file={file_id[:20]}"
 
-    # 1. send_video for video content
+    # 1-3. Single pass over the method chain for this mime type instead of
+    # nested try/except ladders.
     if mime and mime.startswith("video"):
+        send_order = ("send_video", "send_photo", "send_document")
+    elif mime == "animation":
+        send_order = ("send_animation", "send_document")
+    else:
+        send_order = ("send_photo", "send_document")
+
+    for method_name in send_order:
         try:
-            await bot.send_video(chat_id, file_id, caption=caption)
+            await getattr(bot, method_name)(chat_id, file_id, caption=caption)
             return True
         except Exception as exc:
-            logger.debug("send_video failed (%s): %s", tag, exc)
-
-    # 2. send_photo
-    try:
-        await bot.send_photo(chat_id, file_id, caption=caption)
-        return True
-    except Exception as exc:
-        logger.debug("send_photo failed (%s): %s", tag, exc)
-
-    # 3. send_document (still using original file_id)
-    try:
-        await bot.send_document(chat_id, file_id, caption=caption)
-        return True
-    except Exception as exc:
-        logger.debug("send_document failed (%s): %s", tag, exc)
+            logger.debug("%s failed (%s): %s", method_name, tag, exc)
 
-    # 4. Download + re-upload
+    # 4. Download + re-upload (single in-memory copy, no BytesIO shuffle)
     try:
         tg_file = await bot.get_file(file_id)
-        bio = io.BytesIO()
-        await tg_file.download(out=bio)
-        bio.seek(0)
+        payload = bytes(await tg_file.download_as_bytearray())
 
         # Lazy import to keep top-level clean when telegram isn't installed
         from telegram import InputFile  # type: ignore[import-untyped]
@@ -69,19 +61,18 @@ async def send_media_with_fallback(
         if mime and mime.startswith("video"):
             fname = f"meme_{meme_id}.mp4" if meme_id else "meme.mp4"
             await bot.send_video(
-                chat_id, InputFile(bio, filename=fname), caption=caption
+                chat_id, InputFile(payload, filename=fname), caption=caption
             )
         else:
             fname = f"meme_{meme_id}.jpg" if meme_id else "meme.jpg"
             try:
                 await bot.send_photo(
-                    chat_id, InputFile(bio, filename=fname), caption=caption
+                    chat_id, InputFile(payload, filename=fname), caption=caption
                 )
             except Exception:
-                bio.seek(0)
                 fname = f"meme_{meme_id}" if meme_id else "meme"
                 await bot.send_document(
-                    chat_id, InputFile(bio, filename=fname), caption=caption
+                    chat_id, InputFile(payload, filename=fname), caption=caption
                 )
         return True
     except Exception as exc:
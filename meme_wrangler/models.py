@@ -15,7 +15,7 @@ class Meme:
     owner_file_id: str
     mime_type: Optional[str]
     scheduled_ts: int
-    posted: int
+    posted: bool
     created_ts: int
     preview_file_id: Optional[str] = None
     caption: Optional[str] = None
@@ -32,7 +32,7 @@ class Meme:
             owner_file_id=record["owner_file_id"],
             mime_type=record["mime_type"],
             scheduled_ts=int(record["scheduled_ts"]),
-            posted=int(record["posted"]),
+            posted=bool(record["posted"]),
             created_ts=int(record["created_ts"]),
             preview_file_id=record.get("preview_file_id"),
             caption=record.get("caption"),
@@ -46,7 +46,8 @@ class Meme:
             owner_file_id=d["owner_file_id"],
             mime_type=d.get("mime_type"),
             scheduled_ts=int(d["scheduled_ts"]),
-            posted=int(d.get("posted", 0)),
+            # bool() also swallows the 0/1 ints of pre-v6 backups.
+            posted=bool(d.get("posted", False)),
             created_ts=int(d["created_ts"]),
             preview_file_id=d.get("preview_file_id"),
             caption=d.get("caption"),
@@ -72,19 +73,24 @@ class Meme:
 
 @dataclass
 class BackupPayload:
-    """Structure of a full backup JSON file."""
+    """Structure of a full backup JSON file (format version 3).
+
+    Unposted memes are referenced by ID in ``scheduled_meme_ids`` rather
+    than duplicated as full records (versions <= 2 carried a
+    ``scheduled_memes`` record list).
+    """
 
     version: int
     generated_at: str
     memes: list[Meme]
-    scheduled_memes: list[Meme]
+    scheduled_meme_ids: list[int]
 
     def to_dict(self) -> dict:
         return {
             "version": self.version,
             "generated_at": self.generated_at,
             "memes": [m.to_dict() for m in self.memes],
-            "scheduled_memes": [m.to_dict() for m in self.scheduled_memes],
+            "scheduled_meme_ids": list(self.scheduled_meme_ids),
         }
 
 
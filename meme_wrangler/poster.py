@@ -4,26 +4,32 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import deque
 from datetime import datetime
 
 from meme_wrangler.config import cfg, IST
-from meme_wrangler.db import check_pool_health
+from meme_wrangler.db import check_pool_health, connect_listener
 from meme_wrangler.media import send_media_with_fallback
-from meme_wrangler.scheduling import fetch_due_memes, mark_posted
+from meme_wrangler.scheduling import (
+    fetch_due_memes,
+    fetch_min_pending_ts,
+    mark_posted_batch,
+    queue_changed,
+)
 from meme_wrangler import backup as backup_mod
 
 logger = logging.getLogger(__name__)
 
-# In-memory log of recent posting events (capped at 100 entries).
-posting_log: list[str] = []
-
+# In-memory ring of recent posting events; the deque drops the oldest
+# entry automatically, making appends O(1) (list.pop(0) was O(n)).
 _MAX_LOG = 100
 
+posting_log: deque[str] = deque(maxlen=_MAX_LOG)
+
 
 def _append_log(entry: str) -> None:
     posting_log.append(entry)
-    if len(posting_log) > _MAX_LOG:
-        posting_log.pop(0)
 
 
 # ---------------------------------------------------------------------------
@@ -34,6 +40,10 @@ def _append_log(entry: str) -> None:
 async def pop_due_memes_and_post(bot) -> None:
     """Post all memes whose scheduled time has arrived."""
     memes = await fetch_due_memes()
+    posted_ids: list[int] = []
+    # One timestamp per posting cycle; building a tz-aware datetime and
+    # isoformat string per meme (twice per row) added up under bursts.
+    now_iso = datetime.now(IST).isoformat(sep=" ")
     for meme in memes:
         try:
             sent = await send_media_with_fallback(
@@ -45,39 +55,94 @@ async def pop_due_memes_and_post(bot) -> None:
                 meme_id=meme.id,
             )
             if sent:
-                await mark_posted(meme.id)
+                posted_ids.append(meme.id)
                 logger.info("Posted meme id=%s", meme.id)
                 _append_log(
-                    f"[SUCCESS] Posted meme id={meme.id} at "
-                    f"{datetime.now(IST).isoformat(sep=' ')}"
+                    f"[SUCCESS] Posted meme id={meme.id} at {now_iso}"
                 )
             else:
                 _append_log(
-                    f"[FAIL] Meme id={meme.id} at "
-                    f"{datetime.now(IST).isoformat(sep=' ')}: "
+                    f"[FAIL] Meme id={meme.id} at {now_iso}: "
                     "all send methods failed"
                 )
         except asyncio.CancelledError:
             raise
         except Exception as exc:
-            logger.exception("Failed to post meme id=%s: %s", meme.id, exc)
+            logger.exception("Failed to post meme id=%s", meme.id)
             _append_log(
-                f"[FAIL] Meme id={meme.id} at "
-                f"{datetime.now(IST).isoformat(sep=' ')}: "
+                f"[FAIL] Meme id={meme.id} at {now_iso}: "
                 f"{type(exc).__name__}: {exc}"
             )
 
+    # One UPDATE for the whole batch instead of a round-trip per meme.
+    await mark_posted_batch(posted_ids)
+
+
+_POSTER_FALLBACK_SECONDS = 30
+_POSTER_IDLE_SECONDS = 3600  # recheck cadence when the queue is empty
+
+MEME_DUE_CHANNEL = "memes_due"
+
 
 async def periodic_poster(bot) -> None:
-    """Background loop that posts due memes every 30 seconds."""
-    while True:
-        try:
-            await pop_due_memes_and_post(bot)
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            logger.exception("Error in poster loop")
-        await asyncio.sleep(30)
+    """Background loop that posts due memes.
+
+    Rather than polling on a fixed interval, the loop sleeps until the
+    earliest pending scheduled_ts, so a meme rescheduled off the slot
+    grid still posts on time.  Schedule changes wake it immediately,
+    either via ``scheduling.queue_changed`` (in-process) or via a
+    Postgres LISTEN on ``memes_due`` fed by the trigger from migration
+    v5 (other processes, manual SQL).  The timed wakeup remains as the
+    safety net when the listener cannot be established.
+    """
+
+    def _on_meme_due(_conn, _pid, _channel, _payload) -> None:
+        queue_changed.set()
+
+    listener_conn = None
+    try:
+        listener_conn = await connect_listener(MEME_DUE_CHANNEL, _on_meme_due)
+        logger.info("Listening on %r for schedule changes", MEME_DUE_CHANNEL)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception(
+            "Could not open LISTEN connection; relying on timed wakeups"
+        )
+
+    try:
+        while True:
+            queue_changed.clear()
+            try:
+                await pop_due_memes_and_post(bot)
+                min_ts = await fetch_min_pending_ts()
+                if min_ts is None:
+                    delay = _POSTER_IDLE_SECONDS
+                else:
+                    delay = min_ts - time.time() + 1
+                    if delay <= 1:
+                        # A due meme survived the cycle (its send
+                        # failed), so back off instead of retrying the
+                        # failing send once per second.
+                        delay = _POSTER_FALLBACK_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error in poster loop")
+                delay = _POSTER_FALLBACK_SECONDS
+
+            try:
+                await asyncio.wait_for(
+                    queue_changed.wait(), timeout=max(1, delay)
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if listener_conn is not None:
+            try:
+                await listener_conn.close()
+            except Exception:
+                pass
 
 
 # ---------------------------------------------------------------------------
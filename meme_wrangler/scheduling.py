@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import time
-from datetime import datetime, timedelta
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 from meme_wrangler.config import cfg, IST, ist_localize, ensure_ist, SLOTS
-from meme_wrangler.db import get_pool
+from meme_wrangler.db import (
+    execute_prepared,
+    fetch_prepared,
+    fetchrow_prepared,
+    get_pool,
+    register_prepared_statement,
+)
 from meme_wrangler.models import Meme
 
 logger = logging.getLogger(__name__)
@@ -16,6 +25,90 @@ logger = logging.getLogger(__name__)
 
 SCHEDULE_MEME_LOCK_KEY = 984331
 
+# Set whenever the pending queue changes (insert/reschedule) so the poster
+# loop can wake immediately instead of waiting out its sleep.
+queue_changed = asyncio.Event()
+
+# ---------------------------------------------------------------------------
+# Hot SQL - registered for per-connection preparation (see db.py)
+# ---------------------------------------------------------------------------
+
+_MEME_COLUMNS = (
+    "id, owner_file_id, mime_type, scheduled_ts, "
+    "posted, created_ts, preview_file_id, caption"
+)
+
+# Single round-trip insert: the next free slot is computed server-side by
+# the next_meme_slot() function (migration v4), seeded with the last
+# pending scheduled_ts or "now" when the queue is empty.
+_SQL_SCHEDULE_MEME = (
+    "INSERT INTO memes "
+    "    (owner_file_id, mime_type, scheduled_ts, "
+    "     created_ts, preview_file_id, caption) "
+    "SELECT $1, $2, "
+    "       next_meme_slot(COALESCE("
+    "           (SELECT max(scheduled_ts) FROM memes WHERE NOT posted), "
+    "           $3)), "
+    "       $3, $4, $5 "
+    "RETURNING scheduled_ts"
+)
+_SQL_PENDING_MEMES = (
+    f"SELECT {_MEME_COLUMNS} FROM memes "
+    "WHERE NOT posted "
+    "ORDER BY scheduled_ts ASC"
+)
+_SQL_DUE_MEMES = (
+    f"SELECT {_MEME_COLUMNS} FROM memes "
+    "WHERE NOT posted AND scheduled_ts <= $1 "
+    "ORDER BY scheduled_ts ASC"
+)
+_SQL_MEME_BY_ID = f"SELECT {_MEME_COLUMNS} FROM memes WHERE id = $1"
+_SQL_MIN_PENDING_TS = (
+    "SELECT MIN(scheduled_ts) AS t FROM memes WHERE NOT posted"
+)
+_SQL_RESCHEDULE_SINGLE = (
+    "UPDATE memes SET scheduled_ts = $1 WHERE id = $2 AND NOT posted"
+)
+# Atomic claim: select-then-mark in one statement.  SKIP LOCKED means two
+# concurrent claimers can never grab the same row; RETURNING hands back
+# the claimed meme without a second round trip.
+_SQL_CLAIM_NEXT_UNPOSTED = (
+    "UPDATE memes SET posted = TRUE "
+    "WHERE id = ("
+    "    SELECT id FROM memes WHERE NOT posted "
+    "    ORDER BY scheduled_ts ASC LIMIT 1 "
+    "    FOR UPDATE SKIP LOCKED"
+    ") "
+    f"RETURNING {_MEME_COLUMNS}"
+)
+_SQL_CLAIM_UNPOSTED_BY_ID = (
+    "UPDATE memes SET posted = TRUE "
+    "WHERE id = ("
+    "    SELECT id FROM memes WHERE NOT posted AND id = $1 "
+    "    FOR UPDATE SKIP LOCKED"
+    ") "
+    f"RETURNING {_MEME_COLUMNS}"
+)
+
+register_prepared_statement("schedule_meme", _SQL_SCHEDULE_MEME)
+register_prepared_statement("pending_memes", _SQL_PENDING_MEMES)
+register_prepared_statement("due_memes", _SQL_DUE_MEMES)
+register_prepared_statement("meme_by_id", _SQL_MEME_BY_ID)
+register_prepared_statement("min_pending_ts", _SQL_MIN_PENDING_TS)
+register_prepared_statement("reschedule_single", _SQL_RESCHEDULE_SINGLE)
+register_prepared_statement("claim_next_unposted", _SQL_CLAIM_NEXT_UNPOSTED)
+register_prepared_statement("claim_unposted_by_id", _SQL_CLAIM_UNPOSTED_BY_ID)
+
+
+@functools.lru_cache(maxsize=8)
+def calculate_slot_datetime(day: date, slot_index: int) -> datetime:
+    """Return the tz-aware datetime of ``SLOTS[slot_index]`` on *day*.
+
+    Cached because the same handful of (date, slot) pairs is re-localised
+    on every scheduled post, intake, and listing.
+    """
+    return ist_localize(datetime.combine(day, SLOTS[slot_index]))
+
 
 async def compute_next_slot(
     after_dt: Optional[datetime] = None,
@@ -30,23 +123,12 @@ async def compute_next_slot(
         after_dt = ensure_ist(after_dt)
 
     today = after_dt.date()
-    for slot in SLOTS:
-        candidate = ist_localize(datetime.combine(today, slot))
+    for slot_index in range(len(SLOTS)):
+        candidate = calculate_slot_datetime(today, slot_index)
         if candidate > after_dt:
             return candidate
 
-    next_day = today + timedelta(days=1)
-    return ist_localize(datetime.combine(next_day, SLOTS[0]))
-
-
-async def get_last_scheduled_ts(conn) -> Optional[int]:
-    """Fetch the highest ``scheduled_ts`` among unposted memes."""
-    row = await conn.fetchrow(
-        "SELECT scheduled_ts FROM memes "
-        "WHERE posted = 0 "
-        "ORDER BY scheduled_ts DESC LIMIT 1"
-    )
-    return row["scheduled_ts"] if row else None
+    return calculate_slot_datetime(today + timedelta(days=1), 0)
 
 
 async def schedule_meme(
@@ -54,7 +136,12 @@ async def schedule_meme(
     mime_type: str,
     caption: Optional[str] = None,
 ) -> datetime:
-    """Insert a new meme and return its scheduled datetime (IST)."""
+    """Insert a new meme and return its scheduled datetime (IST).
+
+    Slot selection runs server-side inside the INSERT (see
+    ``next_meme_slot`` in db.py), so each intake is a single statement
+    under the advisory lock instead of a SELECT + INSERT pair.
+    """
     pool = await get_pool()
     async with pool.acquire() as conn:
         async with conn.transaction():
@@ -70,59 +157,45 @@ async def schedule_meme(
                 lock_wait_ms,
             )
 
-            last_ts = await get_last_scheduled_ts(conn)
-            if last_ts is None:
-                ref_dt = datetime.now(IST)
-            else:
-                ref_dt = datetime.fromtimestamp(last_ts, tz=IST)
-
-            next_dt = await compute_next_slot(ref_dt)
-            created_ts = int(datetime.now(IST).timestamp())
-
-            await conn.execute(
-                """
-                INSERT INTO memes
-                    (owner_file_id, mime_type, scheduled_ts,
-                     created_ts, preview_file_id, caption)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                """,
+            now_ts = int(datetime.now(IST).timestamp())
+            row = await fetchrow_prepared(
+                conn,
+                "schedule_meme",
+                _SQL_SCHEDULE_MEME,
                 owner_file_id,
                 mime_type,
-                int(next_dt.timestamp()),
-                created_ts,
+                now_ts,
                 owner_file_id,  # preview_file_id = owner_file_id
                 caption,
             )
-    return next_dt
+    queue_changed.set()
+    return datetime.fromtimestamp(row["scheduled_ts"], tz=IST)
 
 
 async def fetch_pending_memes() -> list[Meme]:
     """Return all unposted memes ordered by scheduled time."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            "SELECT id, owner_file_id, mime_type, scheduled_ts, "
-            "       posted, created_ts, preview_file_id, caption "
-            "FROM memes "
-            "WHERE posted = 0 "
-            "ORDER BY scheduled_ts ASC"
-        )
+        rows = await fetch_prepared(conn, "pending_memes", _SQL_PENDING_MEMES)
     return [Meme.from_record(r) for r in rows]
 
 
+async def fetch_min_pending_ts() -> Optional[int]:
+    """Return the earliest pending scheduled_ts, or None when queue is empty."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await fetchrow_prepared(
+            conn, "min_pending_ts", _SQL_MIN_PENDING_TS
+        )
+    return row["t"] if row is not None else None
+
+
 async def fetch_due_memes() -> list[Meme]:
     """Return memes whose scheduled time has passed."""
     now_ts = int(datetime.now(IST).timestamp())
     pool = await get_pool()
     async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            "SELECT id, owner_file_id, mime_type, scheduled_ts, "
-            "       posted, created_ts, preview_file_id, caption "
-            "FROM memes "
-            "WHERE posted = 0 AND scheduled_ts <= $1 "
-            "ORDER BY scheduled_ts ASC",
-            now_ts,
-        )
+        rows = await fetch_prepared(conn, "due_memes", _SQL_DUE_MEMES, now_ts)
     return [Meme.from_record(r) for r in rows]
 
 
@@ -131,7 +204,19 @@ async def mark_posted(meme_id: int) -> None:
     pool = await get_pool()
     async with pool.acquire() as conn:
         await conn.execute(
-            "UPDATE memes SET posted = 1 WHERE id = $1", meme_id
+            "UPDATE memes SET posted = TRUE WHERE id = $1", meme_id
+        )
+
+
+async def mark_posted_batch(meme_ids: list[int]) -> None:
+    """Flag several memes as posted in a single statement."""
+    if not meme_ids:
+        return
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE memes SET posted = TRUE WHERE id = ANY($1::int[])",
+            meme_ids,
         )
 
 
@@ -140,7 +225,7 @@ async def delete_memes(meme_ids: list[int]) -> None:
     pool = await get_pool()
     async with pool.acquire() as conn:
         await conn.execute(
-            "DELETE FROM memes WHERE posted = 0 AND id = ANY($1::int[])",
+            "DELETE FROM memes WHERE NOT posted AND id = ANY($1::int[])",
             meme_ids,
         )
 
@@ -149,54 +234,105 @@ async def fetch_meme_by_id(meme_id: int) -> Optional[Meme]:
     """Fetch a single meme (posted or not)."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT id, owner_file_id, mime_type, scheduled_ts, "
-            "       posted, created_ts, preview_file_id, caption "
-            "FROM memes WHERE id = $1",
-            meme_id,
+        row = await fetchrow_prepared(
+            conn, "meme_by_id", _SQL_MEME_BY_ID, meme_id
         )
     return Meme.from_record(row) if row else None
 
 
-async def fetch_next_unposted(meme_id: Optional[int] = None) -> Optional[Meme]:
-    """Fetch a specific unposted meme or the earliest one."""
+async def claim_next_unposted(meme_id: Optional[int] = None) -> Optional[Meme]:
+    """Atomically claim a specific unposted meme or the earliest one.
+
+    The returned meme is already flagged posted; callers that fail to
+    deliver it must compensate with :func:`unmark_posted`.  Replaces the
+    old SELECT-then-UPDATE pair, which left a window where two callers
+    could post the same meme.
+    """
     pool = await get_pool()
     async with pool.acquire() as conn:
         if meme_id is not None:
-            row = await conn.fetchrow(
-                "SELECT id, owner_file_id, mime_type, scheduled_ts, "
-                "       posted, created_ts, preview_file_id, caption "
-                "FROM memes WHERE posted = 0 AND id = $1",
+            row = await fetchrow_prepared(
+                conn,
+                "claim_unposted_by_id",
+                _SQL_CLAIM_UNPOSTED_BY_ID,
                 meme_id,
             )
         else:
-            row = await conn.fetchrow(
-                "SELECT id, owner_file_id, mime_type, scheduled_ts, "
-                "       posted, created_ts, preview_file_id, caption "
-                "FROM memes WHERE posted = 0 "
-                "ORDER BY scheduled_ts ASC LIMIT 1"
+            row = await fetchrow_prepared(
+                conn, "claim_next_unposted", _SQL_CLAIM_NEXT_UNPOSTED
             )
     return Meme.from_record(row) if row else None
 
 
+async def unmark_posted(meme_id: int) -> None:
+    """Return a claimed meme to the queue after a failed send."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE memes SET posted = FALSE WHERE id = $1", meme_id
+        )
+    queue_changed.set()
+
+
 async def reschedule_single(meme_id: int, new_ts: int) -> None:
     """Change the scheduled timestamp of an unposted meme."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        await conn.execute(
-            "UPDATE memes SET scheduled_ts = $1 "
-            "WHERE id = $2 AND posted = 0",
+        await execute_prepared(
+            conn,
+            "reschedule_single",
+            _SQL_RESCHEDULE_SINGLE,
             new_ts,
             meme_id,
         )
+    queue_changed.set()
+
+
+# Above this many rows, staging via COPY beats shipping parameter arrays
+# through the extended-query protocol.
+_COPY_RESCHEDULE_THRESHOLD = 100
+
 
+async def reschedule_batch(updates: Iterable[tuple[int, int]]) -> None:
+    """Batch-update scheduled timestamps.  Each tuple is ``(new_ts, meme_id)``.
 
-async def reschedule_batch(updates: list[tuple[int, int]]) -> None:
-    """Batch-update scheduled timestamps.  Each tuple is ``(new_ts, meme_id)``."""
+    Accepts any iterable (callers can pass a generator and skip building
+    an intermediate list of tuples).  Small batches run one set-oriented
+    UPDATE over unnested parameter arrays; large ones COPY into a temp
+    table first, which keeps per-row framing off the wire.
+    """
+    ts_arr: list[int] = []
+    id_arr: list[int] = []
+    for ts, meme_id in updates:
+        ts_arr.append(ts)
+        id_arr.append(meme_id)
+    if not id_arr:
+        return
     pool = await get_pool()
     async with pool.acquire() as conn:
-        await conn.executemany(
-            "UPDATE memes SET scheduled_ts = $1 "
-            "WHERE id = $2 AND posted = 0",
-            updates,
-        )
+        if len(id_arr) >= _COPY_RESCHEDULE_THRESHOLD:
+            async with conn.transaction():
+                await conn.execute(
+                    "CREATE TEMP TABLE t_sched (id INTEGER, ts BIGINT) "
+                    "ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(
+                    "t_sched",
+                    records=zip(id_arr, ts_arr),
+                    columns=["id", "ts"],
+                )
+                await conn.execute(
+                    "UPDATE memes SET scheduled_ts = t.ts "
+                    "FROM t_sched t "
+                    "WHERE memes.id = t.id AND NOT posted"
+                )
+        else:
+            await conn.execute(
+                "UPDATE memes SET scheduled_ts = v.ts "
+                "FROM (SELECT * FROM unnest($1::bigint[], $2::int[])) "
+                "    AS v(ts, id) "
+                "WHERE memes.id = v.id AND NOT posted",
+                ts_arr,
+                id_arr,
+            )
+    queue_changed.set()
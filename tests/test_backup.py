@@ -20,6 +20,43 @@ from meme_wrangler.backup import (
 from meme_wrangler.models import Meme
 
 
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _FakeAcquireCtx:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def transaction(self):
+        return _FakeTransaction()
+
+    def cursor(self, _query, prefetch=None):
+        async def _iterate():
+            for row in self._rows:
+                yield row
+
+        return _iterate()
+
+
+class _FakePool:
+    def __init__(self, rows=()):
+        self._rows = rows
+
+    def acquire(self):
+        return _FakeAcquireCtx(self._rows)
+
+
 # ------------------------------------------------------------------
 # Checksum
 # ------------------------------------------------------------------
@@ -66,7 +103,7 @@ def test_meme_from_dict_round_trip():
         "owner_file_id": "abc123",
         "mime_type": "image",
         "scheduled_ts": 1700000000,
-        "posted": 0,
+        "posted": False,
         "created_ts": 1699999000,
         "preview_file_id": "abc123",
         "caption": "funny",
@@ -151,23 +188,56 @@ def test_verify_tampered():
         assert "FAILED" in msg
 
 
-def test_create_backup_generates_distinct_filenames_for_quick_runs():
+def test_create_backup_streams_v3_payload():
+    rows = [
+        {
+            "id": 1,
+            "owner_file_id": "f1",
+            "mime_type": "image",
+            "scheduled_ts": 100,
+            "posted": True,
+            "created_ts": 90,
+            "preview_file_id": "f1",
+            "caption": None,
+        },
+        {
+            "id": 2,
+            "owner_file_id": "f2",
+            "mime_type": "video",
+            "scheduled_ts": 200,
+            "posted": False,
+            "created_ts": 95,
+            "preview_file_id": "f2",
+            "caption": "soon",
+        },
+    ]
+
     with tempfile.TemporaryDirectory() as tmpdir:
         tmp = Path(tmpdir)
 
-        class _AcquireCtx:
-            async def __aenter__(self):
-                return self
+        with patch("meme_wrangler.backup.get_pool", new=AsyncMock(return_value=_FakePool(rows))):
+            with patch("meme_wrangler.backup._backup_dir", return_value=tmp):
+                with patch("meme_wrangler.backup.rotate_backups", return_value=0):
+                    with patch("meme_wrangler.backup.cfg") as mock_cfg:
+                        mock_cfg.backup_store_in_db = False
+                        path, total, sched = asyncio.run(create_backup())
+
+        assert total == 2
+        assert sched == 1
+
+        data = load_backup_data(path.read_bytes())
+        assert data["version"] == 3
+        assert [m["id"] for m in data["memes"]] == [1, 2]
+        assert data["memes"][1]["caption"] == "soon"
+        assert data["scheduled_meme_ids"] == [2]
 
-            async def __aexit__(self, exc_type, exc, tb):
-                return False
+        sidecar = path.with_suffix(path.suffix + ".sha256")
+        assert sidecar.read_text() == _checksum(path.read_bytes())
 
-            async def fetch(self, _query):
-                return []
 
-        class _FakePool:
-            def acquire(self):
-                return _AcquireCtx()
+def test_create_backup_generates_distinct_filenames_for_quick_runs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
 
         with patch("meme_wrangler.backup.get_pool", new=AsyncMock(return_value=_FakePool())):
             with patch("meme_wrangler.backup._backup_dir", return_value=tmp):
@@ -27,6 +27,11 @@ def test_post_init_starts_tasks_and_stores_references(monkeypatch):
             lambda: [bot.TaskSpec("managed_loop", managed_loop, restart_on_failure=False)],
         )
 
+        async def fake_init_db():
+            return None
+
+        monkeypatch.setattr(bot, "init_db", fake_init_db)
+
         application = SimpleNamespace(bot=DummyBot(), bot_data={})
 
         await bot.post_init(application)
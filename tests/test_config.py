@@ -80,6 +80,40 @@ def test_invalid_backup_retain_count_parsed_safely_until_validation(monkeypatch)
     assert "not-an-int" in message
 
 
+def test_db_pool_size_env_overrides(monkeypatch):
+    monkeypatch.setenv("MEMEBOT_DB_POOL_MIN", "2")
+    monkeypatch.setenv("MEMEBOT_DB_POOL_MAX", "8")
+
+    cfg = Config()
+
+    assert cfg.db_pool_min == 2
+    assert cfg.db_pool_max == 8
+
+
+def test_db_pool_size_defaults_to_none_when_unset(monkeypatch):
+    monkeypatch.delenv("MEMEBOT_DB_POOL_MIN", raising=False)
+    monkeypatch.delenv("MEMEBOT_DB_POOL_MAX", raising=False)
+
+    cfg = Config()
+
+    assert cfg.db_pool_min is None
+    assert cfg.db_pool_max is None
+
+
+def test_invalid_db_pool_size_rejected_at_validation(monkeypatch):
+    monkeypatch.setenv("MEMEBOT_DB_POOL_MAX", "not-an-int")
+
+    cfg = Config()
+
+    assert cfg.db_pool_max is None
+    with __import__("pytest").raises(SystemExit) as exc:
+        cfg.validate()
+
+    message = str(exc.value)
+    assert "MEMEBOT_DB_POOL_MAX" in message
+    assert "not-an-int" in message
+
+
 def test_invalid_numeric_parse_errors_are_deterministic(monkeypatch):
     monkeypatch.setenv("MEMEBOT_BACKUP_INTERVAL_HOURS", "bad-float")
     monkeypatch.setenv("MEMEBOT_BACKUP_RETAIN_COUNT", "bad-int")
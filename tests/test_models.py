@@ -9,13 +9,13 @@ def test_meme_to_insert_tuple_order():
         owner_file_id="f1",
         mime_type="image",
         scheduled_ts=100,
-        posted=0,
+        posted=False,
         created_ts=90,
         preview_file_id="f1",
         caption="cap",
     )
     t = m.to_insert_tuple()
-    assert t == (1, "f1", "image", 100, 0, 90, "f1", "cap")
+    assert t == (1, "f1", "image", 100, False, 90, "f1", "cap")
 
 
 def test_meme_from_dict_missing_optional():
@@ -28,7 +28,7 @@ def test_meme_from_dict_missing_optional():
     m = Meme.from_dict(d)
     assert m.mime_type is None
     assert m.caption is None
-    assert m.posted == 0
+    assert m.posted is False
 
 
 def test_backup_payload_to_dict():
@@ -37,16 +37,17 @@ def test_backup_payload_to_dict():
         owner_file_id="f",
         mime_type="image",
         scheduled_ts=100,
-        posted=0,
+        posted=False,
         created_ts=90,
     )
     bp = BackupPayload(
-        version=2,
+        version=3,
         generated_at="2025-01-01T00:00:00",
         memes=[m],
-        scheduled_memes=[m],
+        scheduled_meme_ids=[m.id],
     )
     d = bp.to_dict()
-    assert d["version"] == 2
+    assert d["version"] == 3
     assert len(d["memes"]) == 1
     assert d["memes"][0]["owner_file_id"] == "f"
+    assert d["scheduled_meme_ids"] == [1]
@@ -5,7 +5,7 @@ from datetime import datetime
 
 import pytest
 
-from meme_wrangler.config import SLOTS
+from meme_wrangler.config import IST, SLOTS
 from meme_wrangler.scheduling import compute_next_slot, schedule_meme
 
 
@@ -94,20 +94,24 @@ class _FakeConn:
         return _FakeTransaction()
 
     async def fetchrow(self, query, *args):
-        if "ORDER BY scheduled_ts DESC" in query:
-            if not self.scheduled:
-                return None
-            return {"scheduled_ts": max(self.scheduled)}
+        if "INSERT INTO memes" in query:
+            # Mirror next_meme_slot(): slot after the last pending meme,
+            # or after "now" ($3) when the queue is empty.
+            now_ts = args[2]
+            ref_ts = max(self.scheduled) if self.scheduled else now_ts
+            next_dt = await compute_next_slot(
+                datetime.fromtimestamp(ref_ts, tz=IST)
+            )
+            next_ts = int(next_dt.timestamp())
+            self.scheduled.append(next_ts)
+            self._advisory_lock.release()
+            return {"scheduled_ts": next_ts}
         raise AssertionError(f"Unexpected fetchrow query: {query}")
 
     async def execute(self, query, *args):
         if "pg_advisory_xact_lock" in query:
             await self._advisory_lock.acquire()
             return "SELECT 1"
-        if "INSERT INTO memes" in query:
-            self.scheduled.append(args[2])
-            self._advisory_lock.release()
-            return "INSERT 0 1"
         raise AssertionError(f"Unexpected execute query: {query}")
 
 